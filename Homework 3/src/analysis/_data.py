@@ -0,0 +1,87 @@
+"""
+Shared daily_data loaders for the analysis modules.
+"""
+import sqlite3
+from typing import Dict, List
+
+import pandas as pd
+
+from db import SQL_IN_CHUNK_SIZE
+
+# Read daily_data in typed chunks so pandas skips dtype inference
+OHLCV_CHUNK_SIZE = 50_000
+OHLCV_DTYPES = {
+    "open": "float64",
+    "high": "float64",
+    "low": "float64",
+    "close": "float64",
+    "volume": "float64",
+}
+
+
+def load_ohlcv_for_symbol(conn: sqlite3.Connection, symbol: str) -> pd.DataFrame:
+    """
+    Load daily OHLCV data for a given symbol from daily_data table.
+    """
+    query = """
+        SELECT d.date, d.open, d.high, d.low, d.close, d.volume
+        FROM daily_data d
+        JOIN cryptocurrencies c ON c.id = d.symbol_id
+        WHERE c.symbol = ?
+        ORDER BY d.date
+    """
+    chunks = list(pd.read_sql_query(
+        query,
+        conn,
+        params=(symbol,),
+        chunksize=OHLCV_CHUNK_SIZE,
+        dtype=OHLCV_DTYPES,
+        parse_dates=["date"],
+    ))
+    if not chunks:
+        return pd.DataFrame(columns=list(OHLCV_DTYPES))
+
+    df = pd.concat(chunks, ignore_index=True)
+    if df.empty:
+        return df
+
+    df.set_index("date", inplace=True)
+    return df
+
+
+def load_ohlcv_for_symbols(
+    conn: sqlite3.Connection, symbols: List[str]
+) -> Dict[str, pd.DataFrame]:
+    """
+    Load daily OHLCV for many symbols with one query per IN-list chunk and
+    split it per symbol. Symbols without data are missing from the result.
+    """
+    frames: Dict[str, pd.DataFrame] = {}
+    symbols = list(dict.fromkeys(symbols))
+
+    for start in range(0, len(symbols), SQL_IN_CHUNK_SIZE):
+        batch = symbols[start:start + SQL_IN_CHUNK_SIZE]
+        placeholders = ",".join("?" * len(batch))
+        query = f"""
+            SELECT c.symbol, d.date, d.open, d.high, d.low, d.close, d.volume
+            FROM daily_data d
+            JOIN cryptocurrencies c ON c.id = d.symbol_id
+            WHERE c.symbol IN ({placeholders})
+            ORDER BY c.symbol, d.date
+        """
+        chunks = list(pd.read_sql_query(
+            query,
+            conn,
+            params=batch,
+            chunksize=OHLCV_CHUNK_SIZE,
+            dtype=OHLCV_DTYPES,
+            parse_dates=["date"],
+        ))
+        if not chunks:
+            continue
+
+        df = pd.concat(chunks, ignore_index=True)
+        for symbol, group in df.groupby("symbol", sort=False):
+            frames[symbol] = group.drop(columns="symbol").set_index("date")
+
+    return frames
@@ -1,5 +1,7 @@
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from typing import List, Optional
 
 import numpy as np
 import pandas as pd
@@ -7,38 +9,71 @@ import pandas as pd
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.metrics import mean_squared_error, mean_absolute_percentage_error, r2_score
 
+import tensorflow as tf
+from keras import mixed_precision
 from keras.models import Sequential
 from keras.layers import LSTM, Dense, Dropout
+from keras.optimizers import Adam
 
+from analysis._data import OHLCV_DTYPES, load_ohlcv_for_symbol, load_ohlcv_for_symbols
+
+# Mixed precision only pays off on GPU tensor cores; CPU stays in float32
+HAS_GPU = bool(tf.config.list_physical_devices("GPU"))
+
+# Larger batches keep a GPU busy; CPU training keeps the old default
+GPU_BATCH_SIZE = 256
+CPU_BATCH_SIZE = 32
+PREDICT_BATCH_SIZE = 1024
 
-def _load_ohlcv_for_symbol(conn: sqlite3.Connection, symbol: str) -> pd.DataFrame:
-    query = """
-        SELECT d.date, d.open, d.high, d.low, d.close, d.volume
-        FROM daily_data d
-        JOIN cryptocurrencies c ON c.id = d.symbol_id
-        WHERE c.symbol = ?
-        ORDER BY d.date
-    """
-    df = pd.read_sql_query(query, conn, params=(symbol,))
-    if df.empty:
-        return df
 
-    df["date"] = pd.to_datetime(df["date"])
-    df.set_index("date", inplace=True)
-    return df
+@contextmanager
+def _gpu_mixed_precision():
+    """
+    Use the mixed_float16 policy on GPU for the duration of the block and
+    restore the previous global policy afterwards.
+    """
+    if not HAS_GPU:
+        yield
+        return
+    previous = mixed_precision.global_policy()
+    mixed_precision.set_global_policy("mixed_float16")
+    try:
+        yield
+    finally:
+        mixed_precision.set_global_policy(previous)
 
 
-def _create_sequences(data: np.ndarray, lookback: int):
+def _windowed_dataset(
+    data: np.ndarray,
+    lookback: int,
+    start: int,
+    stop: int,
+    with_targets: bool = True,
+    shuffle: bool = False,
+) -> tf.data.Dataset:
     """
-    Turn [T, features] into sequences of shape [num_samples, lookback, features]
-    and targets [num_samples].
+    tf.data pipeline over samples k in [start, stop): the sequence
+    data[k:k + lookback] and, optionally, the target data[k + lookback, 3].
+
+    Windows are sliced from one copy of `data` on demand, so the
+    [num_samples, lookback, features] tensor is never built. Shuffling
+    permutes the sample indices, not the windows.
     """
-    X, y = [], []
-    for i in range(lookback, len(data)):
-        X.append(data[i - lookback:i])
-        # predict next day close price
-        y.append(data[i, 3])
-    return np.array(X), np.array(y)
+    series = tf.constant(data)
+    window_shape = (lookback, data.shape[1])
+
+    def _window(k):
+        return tf.ensure_shape(series[k:k + lookback], window_shape)
+
+    def _window_and_target(k):
+        return _window(k), series[k + lookback, 3]
+
+    indices = tf.data.Dataset.range(start, stop)
+    if shuffle:
+        indices = indices.shuffle(stop - start)
+
+    fn = _window_and_target if with_targets else _window
+    return indices.map(fn, num_parallel_calls=tf.data.AUTOTUNE)
 
 
 def train_lstm_for_symbol(
@@ -47,55 +82,95 @@ def train_lstm_for_symbol(
     lookback_days: int = 30,
     horizon_days: int = 1,
     epochs: int = 20,
-    batch_size: int = 32,
+    batch_size: Optional[int] = None,
+    df: Optional[pd.DataFrame] = None,
 ):
     """
     Train an LSTM on OHLCV for a given symbol and store predictions + metrics
     into lstm_predictions table.
+
+    batch_size defaults to GPU_BATCH_SIZE when a GPU is visible, otherwise
+    CPU_BATCH_SIZE. OHLCV is loaded from conn unless df is given.
     """
-    df = _load_ohlcv_for_symbol(conn, symbol)
+    if batch_size is None:
+        batch_size = GPU_BATCH_SIZE if HAS_GPU else CPU_BATCH_SIZE
+
+    if df is None:
+        df = load_ohlcv_for_symbol(conn, symbol)
     if df.empty:
         print(f"[lstm] No OHLCV data for {symbol}")
         return
 
-    
-    df = df[["open", "high", "low", "close", "volume"]].astype(float)
-
-    values = df.values
+    # columns are already float64 from the typed read
+    values = df[["open", "high", "low", "close", "volume"]].to_numpy()
     scaler = MinMaxScaler()
-    scaled = scaler.fit_transform(values)
+    # float32 inputs keep Keras on the fused cuDNN LSTM kernel
+    scaled = scaler.fit_transform(values).astype(np.float32)
 
-    X, y = _create_sequences(scaled, lookback_days)
-    if len(X) < 10:
+    # sample k is the window scaled[k:k + lookback_days], target the next close
+    num_samples = len(scaled) - lookback_days
+    if num_samples < 10:
         print(f"[lstm] Not enough data for {symbol} with lookback={lookback_days}")
         return
 
     # split 70% train / 30% test
-    split_index = int(len(X) * 0.7)
-    X_train, X_test = X[:split_index], X[split_index:]
-    y_train, y_test = y[:split_index], y[split_index:]
+    split_index = int(num_samples * 0.7)
+    y_test = scaled[lookback_days + split_index:, 3]
 
     # Build LSTM model
+    # Layer arguments match the cuDNN fast path requirements
     model = Sequential()
-    model.add(LSTM(64, return_sequences=True, input_shape=(lookback_days, X.shape[2])))
+    model.add(LSTM(
+        64,
+        return_sequences=True,
+        activation="tanh",
+        recurrent_activation="sigmoid",
+        use_bias=True,
+        recurrent_dropout=0.0,
+        unroll=False,
+        input_shape=(lookback_days, scaled.shape[1]),
+    ))
     model.add(Dropout(0.2))
-    model.add(LSTM(32))
+    model.add(LSTM(
+        32,
+        activation="tanh",
+        recurrent_activation="sigmoid",
+        use_bias=True,
+        recurrent_dropout=0.0,
+        unroll=False,
+    ))
     model.add(Dropout(0.2))
-    model.add(Dense(1))
+    # keep the output layer in float32 so the loss stays numerically safe
+    model.add(Dense(1, dtype="float32"))
 
-    model.compile(optimizer="adam", loss="mse")
-    model.fit(X_train, y_train, epochs=epochs, batch_size=batch_size, verbose=1)
+    optimizer = Adam()
+    if mixed_precision.global_policy().compute_dtype == "float16":
+        optimizer = mixed_precision.LossScaleOptimizer(optimizer)
+    model.compile(optimizer=optimizer, loss="mse")
+
+    # tf.data prefetches the next batch while the current one trains
+    train_ds = (
+        _windowed_dataset(scaled, lookback_days, 0, split_index, shuffle=True)
+        .batch(batch_size)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+    model.fit(train_ds, epochs=epochs, verbose=1)
 
     # Evaluate
-    y_pred_test = model.predict(X_test)
+    test_ds = (
+        _windowed_dataset(scaled, lookback_days, split_index, num_samples, with_targets=False)
+        .batch(PREDICT_BATCH_SIZE)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+    y_pred_test = model.predict(test_ds)
 
     # Inverse scale only the close price
-    # Build a helper array so we can invert using the same scaler
+    # MinMaxScaler maps X -> X * scale_ + min_, so invert column 3 directly
+    close_scale = scaler.scale_[3]
+    close_min = scaler.min_[3]
+
     def _invert_scaled_close(scaled_close_vals):
-        helper = np.zeros((len(scaled_close_vals), scaled.shape[1]))
-        helper[:, 3] = scaled_close_vals.reshape(-1)  
-        inv = scaler.inverse_transform(helper)
-        return inv[:, 3]
+        return (scaled_close_vals.reshape(-1) - close_min) / close_scale
 
     y_test_inv = _invert_scaled_close(y_test)
     y_pred_inv = _invert_scaled_close(y_pred_test)
@@ -117,6 +192,7 @@ def train_lstm_for_symbol(
 
     # Store predictions for the test period
     dates = df.index[lookback_days + split_index : lookback_days + split_index + len(y_test_inv)]
+    date_strs = dates.strftime("%Y-%m-%d").tolist()
     created_at = datetime.utcnow().isoformat()
     model_name = "LSTM_close_v1"
 
@@ -139,22 +215,21 @@ def train_lstm_for_symbol(
             created_at      = excluded.created_at
     """
 
-    rows = []
-    for d, pred_close in zip(dates, y_pred_inv):
-        rows.append(
-            (
-                symbol_id,
-                d.date().isoformat(),
-                horizon_days,
-                lookback_days,
-                float(pred_close),
-                rmse,
-                mape,
-                r2,
-                model_name,
-                created_at,
-            )
+    rows = [
+        (
+            symbol_id,
+            d,
+            horizon_days,
+            lookback_days,
+            pred_close,
+            rmse,
+            mape,
+            r2,
+            model_name,
+            created_at,
         )
+        for d, pred_close in zip(date_strs, y_pred_inv.tolist())
+    ]
 
     if rows:
         cur.executemany(insert_sql, rows)
@@ -164,7 +239,8 @@ def train_lstm_for_symbol(
     # Predict one step into the future - the next day
     last_window = scaled[-lookback_days:]
     last_window = np.expand_dims(last_window, axis=0)
-    next_scaled = model.predict(last_window)
+    # a direct call skips predict()'s dataset/step-loop setup for one sample
+    next_scaled = np.asarray(model(last_window, training=False))
     next_close = _invert_scaled_close(next_scaled)[0]
 
     future_date = df.index[-1].date() + timedelta(days=horizon_days)
@@ -186,3 +262,16 @@ def train_lstm_for_symbol(
     )
     conn.commit()
     print(f"[lstm] Stored future prediction for {symbol} on {future_date}")
+
+
+def train_lstm_for_symbols(conn: sqlite3.Connection, symbols: List[str], **kwargs):
+    """
+    Train one LSTM per symbol, reading OHLCV for all of them in one query.
+    Keyword arguments are passed to train_lstm_for_symbol. On GPU the models
+    train in mixed float16 precision.
+    """
+    frames = load_ohlcv_for_symbols(conn, symbols)
+    empty = pd.DataFrame(columns=list(OHLCV_DTYPES))
+    with _gpu_mixed_precision():
+        for symbol in symbols:
+            train_lstm_for_symbol(conn, symbol, df=frames.get(symbol, empty), **kwargs)
@@ -6,12 +6,22 @@ import pandas as pd
 import re
 from collections import Counter
 
+# Token categories for the precompiled vocabulary
+POSITIVE = 0
+NEGATIVE = 1
+INTENSIFIER = 2
+NEGATION = 3
+
 class SimpleSentimentAnalyzer:
     """
     Basit keyword-based sentiment analyzer.
     Büyük kütüphanelere ihtiyaç duymaz.
     """
     
+    # URLs, mentions, hashtags / special characters
+    _URL_RE = re.compile(r'http\S+|@\S+|#\S+')
+    _PUNCT_RE = re.compile(r'[^\w\s]')
+    
     def __init__(self):
         # Cryptocurrency-specific sentiment dictionaries
         self.positive_words = {
@@ -37,6 +47,13 @@ class SimpleSentimentAnalyzer:
         
         # Negation words
         self.negations = {'not', "n't", 'no', 'never', 'none', 'nothing'}
+        
+        # One lookup per token: token -> (category, weight)
+        self._vocab = {}
+        self._vocab.update({w: (NEGATION, 0.0) for w in self.negations})
+        self._vocab.update({w: (INTENSIFIER, v) for w, v in self.intensifiers.items()})
+        self._vocab.update({w: (NEGATIVE, 1.0) for w in self.negative_words})
+        self._vocab.update({w: (POSITIVE, 1.0) for w in self.positive_words})
     
     def clean_text(self, text):
         """Clean and tokenize text"""
@@ -47,8 +64,8 @@ class SimpleSentimentAnalyzer:
         text = text.lower()
         
         # Remove URLs, mentions, and special characters
-        text = re.sub(r'http\S+|@\S+|#\S+', '', text)
-        text = re.sub(r'[^\w\s]', ' ', text)
+        text = self._URL_RE.sub('', text)
+        text = self._PUNCT_RE.sub(' ', text)
         
         # Tokenize
         tokens = text.split()
@@ -62,28 +79,31 @@ class SimpleSentimentAnalyzer:
         if not tokens:
             return {'polarity': 0.0, 'label': 'NEUTRAL', 'score': 0.0}
         
+        vocab = self._vocab
+        categories = [vocab.get(token, (None, 0.0)) for token in tokens]
+        
         positive_score = 0
         negative_score = 0
         intensity = 1.0
         
         # Check for negations and intensifiers
-        for i, token in enumerate(tokens):
-            if token in self.intensifiers:
-                intensity = self.intensifiers[token]
-            elif token in self.negations:
+        for i, (cat, weight) in enumerate(categories):
+            if cat == INTENSIFIER:
+                intensity = weight
+            elif cat == NEGATION:
                 # If negation found, invert next sentiment word
-                if i + 1 < len(tokens):
-                    next_word = tokens[i + 1]
-                    if next_word in self.positive_words:
+                if i + 1 < len(categories):
+                    next_cat = categories[i + 1][0]
+                    if next_cat == POSITIVE:
                         negative_score += 1 * intensity
-                    elif next_word in self.negative_words:
+                    elif next_cat == NEGATIVE:
                         positive_score += 1 * intensity
         
         # Count positive and negative words
-        for token in tokens:
-            if token in self.positive_words:
+        for cat, _ in categories:
+            if cat == POSITIVE:
                 positive_score += 1 * intensity
-            elif token in self.negative_words:
+            elif cat == NEGATIVE:
                 negative_score += 1 * intensity
         
         # Calculate polarity (-1 to 1)
@@ -154,7 +174,10 @@ class SimpleSentimentAnalyzer:
 
 
 def generate_sample_data(symbol, num_items=100):
-    """Generate sample news and social media data"""
+    """
+    Generate sample news and social media data.
+    Returns one list per field: {'text', 'date', 'source', 'engagement'}.
+    """
     import random
     
     positive_templates = [
@@ -183,7 +206,8 @@ def generate_sample_data(symbol, num_items=100):
     
     all_templates = positive_templates + negative_templates + neutral_templates
     
-    data = []
+    now = datetime.now()
+    texts, dates, sources, engagements = [], [], [], []
     for i in range(num_items):
         template = random.choice(all_templates)
         # Add some crypto-specific jargon
@@ -192,16 +216,19 @@ def generate_sample_data(symbol, num_items=100):
         
         # Random date in last 30 days
         days_ago = random.randint(0, 30)
-        date = (datetime.now() - timedelta(days=days_ago)).strftime('%Y-%m-%d')
+        date = (now - timedelta(days=days_ago)).strftime('%Y-%m-%d')
         
-        data.append({
-            'text': text,
-            'date': date,
-            'source': random.choice(['Twitter', 'Reddit', 'News', 'Telegram']),
-            'engagement': random.randint(10, 10000)
-        })
-    
-    return data
+        texts.append(text)
+        dates.append(date)
+        sources.append(random.choice(['Twitter', 'Reddit', 'News', 'Telegram']))
+        engagements.append(random.randint(10, 10000))
+    
+    return {
+        'text': texts,
+        'date': dates,
+        'source': sources,
+        'engagement': engagements
+    }
 
 
 def create_sentiment_tables(conn):
@@ -269,8 +296,7 @@ def analyze_symbol_sentiment(conn, symbol, days=30):
     
     # Analyze sentiment
     analyzer = SimpleSentimentAnalyzer()
-    texts = [item['text'] for item in sample_data]
-    analysis_result = analyzer.analyze_batch(texts)
+    analysis_result = analyzer.analyze_batch(sample_data['text'])
     
     # Determine signal
     if analysis_result['sentiment_score'] > 0.2:
@@ -281,7 +307,9 @@ def analyze_symbol_sentiment(conn, symbol, days=30):
         signal = 'NEUTRAL'
     
     # Store analysis
-    analysis_date = datetime.now().strftime('%Y-%m-%d')
+    now = datetime.now()
+    analysis_date = now.strftime('%Y-%m-%d')
+    created_at = now.isoformat()
     
     cur.execute("""
         INSERT INTO sentiment_analysis (
@@ -307,7 +335,7 @@ def analyze_symbol_sentiment(conn, symbol, days=30):
         analysis_result['sentiment_score'],
         analysis_result['total'],
         signal,
-        datetime.now().isoformat()
+        created_at
     ))
     
     # Get the inserted ID
@@ -315,21 +343,22 @@ def analyze_symbol_sentiment(conn, symbol, days=30):
     sentiment_id = cur.fetchone()[0]
     
     # Store individual items
-    for item in sample_data[:50]:  # Store first 50 items
-        sentiment = analyzer.analyze_sentiment(item['text'])
-        
-        cur.execute("""
-            INSERT INTO sentiment_items (
-                sentiment_id, text, polarity, label, source, engagement
-            ) VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            sentiment_id,
-            item['text'][:500],  # Limit text length
-            sentiment['polarity'],
-            sentiment['label'],
-            item['source'],
-            item['engagement']
-        ))
+    num_stored = 50  # Store first 50 items
+    item_texts = sample_data['text'][:num_stored]
+    sentiments = [analyzer.analyze_sentiment(text) for text in item_texts]
+    
+    cur.executemany("""
+        INSERT INTO sentiment_items (
+            sentiment_id, text, polarity, label, source, engagement
+        ) VALUES (?, ?, ?, ?, ?, ?)
+    """, list(zip(
+        [sentiment_id] * len(item_texts),
+        [text[:500] for text in item_texts],  # Limit text length
+        [sentiment['polarity'] for sentiment in sentiments],
+        [sentiment['label'] for sentiment in sentiments],
+        sample_data['source'][:num_stored],
+        sample_data['engagement'][:num_stored]
+    )))
     
     conn.commit()
     
@@ -1,35 +1,21 @@
+import os
 import sqlite3
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from datetime import datetime
-from typing import List, Dict
+from itertools import islice
+from typing import List, Tuple
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 from ta.momentum import RSIIndicator, StochasticOscillator
-from ta.trend import MACD, ADXIndicator, CCIIndicator
-from ta.volatility import BollingerBands
-
-TECHNICAL_TIMEFRAMES = ["1D", "1W", "1M"]
+from ta.trend import MACD, ADXIndicator
 
+from analysis._data import load_ohlcv_for_symbol, load_ohlcv_for_symbols
+from db import fetch_symbol_ids
 
-def _load_ohlcv_for_symbol(conn: sqlite3.Connection, symbol: str) -> pd.DataFrame:
-    """
-    Load daily OHLCV data for a given symbol from daily_data table.
-    """
-    query = """
-        SELECT d.date, d.open, d.high, d.low, d.close, d.volume
-        FROM daily_data d
-        JOIN cryptocurrencies c ON c.id = d.symbol_id
-        WHERE c.symbol = ?
-        ORDER BY d.date
-    """
-    df = pd.read_sql_query(query, conn, params=(symbol,))
-    if df.empty:
-        return df
-
-    df["date"] = pd.to_datetime(df["date"])
-    df.set_index("date", inplace=True)
-    return df
+TECHNICAL_TIMEFRAMES = ["1D", "1W", "1M"]
 
 
 def _resample_timeframe(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
@@ -61,11 +47,39 @@ def _weighted_moving_average(series: pd.Series, window: int) -> pd.Series:
     """
     WMA implementation.
     """
-    weights = np.arange(1, window + 1)
-    return series.rolling(window).apply(
-        lambda values: np.dot(values, weights) / weights.sum(),
-        raw=True
-    )
+    values = series.to_numpy(dtype=np.float64)
+    if len(values) < window:
+        return pd.Series(np.nan, index=series.index)
+
+    weights = np.arange(1, window + 1, dtype=np.float64)
+    weights /= weights.sum()
+
+    # convolve flips the kernel, so reverse it to weight the newest value most
+    wma = np.convolve(values, weights[::-1], mode="valid")
+    result = np.concatenate([np.full(window - 1, np.nan), wma])
+    return pd.Series(result, index=series.index)
+
+
+def _commodity_channel_index(
+    high: pd.Series,
+    low: pd.Series,
+    close: pd.Series,
+    window: int = 20,
+    constant: float = 0.015,
+) -> pd.Series:
+    """
+    CCI, same formula as ta's CCIIndicator. The mean absolute deviation is
+    computed over a strided window view instead of a per-window callback.
+    """
+    typical_price = ((high + low + close) / 3.0).to_numpy(dtype=np.float64)
+    cci = np.full(len(typical_price), np.nan)
+    if len(typical_price) >= window:
+        windows = sliding_window_view(typical_price, window)
+        mean = windows.mean(axis=1)
+        mad = np.abs(windows - mean[:, None]).mean(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cci[window - 1:] = (typical_price[window - 1:] - mean) / (constant * mad)
+    return pd.Series(cci, index=close.index)
 
 
 def _compute_indicators_for_df(ohlcv: pd.DataFrame) -> pd.DataFrame:
@@ -95,110 +109,124 @@ def _compute_indicators_for_df(ohlcv: pd.DataFrame) -> pd.DataFrame:
     df["stoch_d"] = stoch.stoch_signal()
 
     df["adx"] = ADXIndicator(high=high, low=low, close=close, window=14).adx()
-    df["cci"] = CCIIndicator(high=high, low=low, close=close, window=20).cci()
+    df["cci"] = _commodity_channel_index(high, low, close, window=20)
 
     # --- Moving-average style ---
     df["sma"] = close.rolling(window).mean()
     df["ema"] = close.ewm(span=window, adjust=False).mean()
     df["wma"] = _weighted_moving_average(close, window)
 
-    bb = BollingerBands(close=close, window=20, window_dev=2)
-    df["bb_middle"] = bb.bollinger_mavg()
-    df["bb_upper"] = bb.bollinger_hband()
-    df["bb_lower"] = bb.bollinger_lband()
+    # Bollinger Bands (20, 2) share the 20-period SMA; population std like ta
+    bb_std = close.rolling(window).std(ddof=0)
+    df["bb_middle"] = df["sma"]
+    df["bb_upper"] = df["sma"] + 2 * bb_std
+    df["bb_lower"] = df["sma"] - 2 * bb_std
 
     df["vol_sma"] = volume.rolling(window).mean()
 
     return df
 
 
-def _generate_signal(row: pd.Series) -> str:
-    rsi = row["rsi"]
-    macd = row["macd"]
-    macd_signal = row["macd_signal"]
+INDICATOR_COLUMNS = [
+    "rsi", "macd", "macd_signal", "macd_hist",
+    "stoch_k", "stoch_d", "adx", "cci",
+    "sma", "ema", "wma",
+    "bb_upper", "bb_middle", "bb_lower",
+    "vol_sma",
+]
 
-    if pd.isna(rsi) or pd.isna(macd) or pd.isna(macd_signal):
-        return "HOLD"
 
+def _generate_signals(rsi: np.ndarray, macd: np.ndarray, macd_signal: np.ndarray) -> np.ndarray:
+    """
+    Vectorized BUY / SELL / HOLD signal for every row.
+    NaN inputs compare False and fall through to HOLD.
+    """
     # Oversold + bullish MACD -> BUY
-    if rsi < 30 and macd > macd_signal:
-        return "BUY"
+    buy = (rsi < 30) & (macd > macd_signal)
 
     # Overbought + bearish MACD -> SELL
-    if rsi > 70 and macd < macd_signal:
-        return "SELL"
+    sell = (rsi > 70) & (macd < macd_signal)
 
-    return "HOLD"
+    return np.where(buy, "BUY", np.where(sell, "SELL", "HOLD"))
 
 
-def compute_and_store_indicators_for_symbol(
+INSERT_INDICATORS_SQL = """
+    INSERT INTO technical_indicators (
+        symbol_id, date, timeframe,
+        rsi, macd, macd_signal, macd_hist,
+        stoch_k, stoch_d, adx, cci,
+        sma, ema, wma,
+        bb_upper, bb_middle, bb_lower,
+        vol_sma,
+        signal
+    )
+    VALUES (
+        ?, ?, ?,
+        ?, ?, ?, ?,
+        ?, ?, ?, ?,
+        ?, ?, ?,
+        ?, ?, ?,
+        ?,
+        ?
+    )
+    ON CONFLICT(symbol_id, date, timeframe) DO UPDATE SET
+        rsi         = excluded.rsi,
+        macd        = excluded.macd,
+        macd_signal = excluded.macd_signal,
+        macd_hist   = excluded.macd_hist,
+        stoch_k     = excluded.stoch_k,
+        stoch_d     = excluded.stoch_d,
+        adx         = excluded.adx,
+        cci         = excluded.cci,
+        sma         = excluded.sma,
+        ema         = excluded.ema,
+        wma         = excluded.wma,
+        bb_upper    = excluded.bb_upper,
+        bb_middle   = excluded.bb_middle,
+        bb_lower    = excluded.bb_lower,
+        vol_sma     = excluded.vol_sma,
+        signal      = excluded.signal
+"""
+
+
+def _indicator_rows_for_symbol(
     conn: sqlite3.Connection,
     symbol: str,
     timeframes: List[str] = None,
-) -> None:
+    base_df: pd.DataFrame = None,
+) -> List[Tuple]:
     """
-    Main entry point:
-    - load OHLCV from daily_data
-    - resample to each timeframe (1D, 1W, 1M)
-    - compute indicators
-    - generate signals
-    - upsert into technical_indicators table
+    Build technical_indicators rows for every timeframe of one symbol.
+    OHLCV is loaded from conn unless base_df is given. Only reads from conn.
     """
-    if timeframes is None:
-        timeframes = TECHNICAL_TIMEFRAMES
-
-    base_df = _load_ohlcv_for_symbol(conn, symbol)
+    if base_df is None:
+        base_df = load_ohlcv_for_symbol(conn, symbol)
     if base_df.empty:
         print(f"[technical] No OHLCV data for symbol {symbol}")
-        return
+        return []
 
     # get symbol_id
-    cur = conn.cursor()
-    cur.execute("SELECT id FROM cryptocurrencies WHERE symbol = ?", (symbol,))
-    row = cur.fetchone()
-    if not row:
+    symbol_id = fetch_symbol_ids(conn, [symbol]).get(symbol)
+    if symbol_id is None:
         print(f"[technical] Symbol {symbol} not found in cryptocurrencies table")
-        return
-    symbol_id = row["id"] if isinstance(row, sqlite3.Row) else row[0]
-
-    sql = """
-        INSERT INTO technical_indicators (
-            symbol_id, date, timeframe,
-            rsi, macd, macd_signal, macd_hist,
-            stoch_k, stoch_d, adx, cci,
-            sma, ema, wma,
-            bb_upper, bb_middle, bb_lower,
-            vol_sma,
-            signal
-        )
-        VALUES (
-            :symbol_id, :date, :timeframe,
-            :rsi, :macd, :macd_signal, :macd_hist,
-            :stoch_k, :stoch_d, :adx, :cci,
-            :sma, :ema, :wma,
-            :bb_upper, :bb_middle, :bb_lower,
-            :vol_sma,
-            :signal
-        )
-        ON CONFLICT(symbol_id, date, timeframe) DO UPDATE SET
-            rsi         = excluded.rsi,
-            macd        = excluded.macd,
-            macd_signal = excluded.macd_signal,
-            macd_hist   = excluded.macd_hist,
-            stoch_k     = excluded.stoch_k,
-            stoch_d     = excluded.stoch_d,
-            adx         = excluded.adx,
-            cci         = excluded.cci,
-            sma         = excluded.sma,
-            ema         = excluded.ema,
-            wma         = excluded.wma,
-            bb_upper    = excluded.bb_upper,
-            bb_middle   = excluded.bb_middle,
-            bb_lower    = excluded.bb_lower,
-            vol_sma     = excluded.vol_sma,
-            signal      = excluded.signal
+        return []
+
+    return _indicator_rows(symbol_id, symbol, base_df, timeframes)
+
+
+def _indicator_rows(
+    symbol_id: int,
+    symbol: str,
+    base_df: pd.DataFrame,
+    timeframes: List[str] = None,
+) -> List[Tuple]:
     """
+    Build technical_indicators rows from already loaded OHLCV; no database access.
+    """
+    if timeframes is None:
+        timeframes = TECHNICAL_TIMEFRAMES
 
+    rows: List[Tuple] = []
     for tf in timeframes:
         ohlcv = _resample_timeframe(base_df, tf)
         if ohlcv.empty:
@@ -207,31 +235,104 @@ def compute_and_store_indicators_for_symbol(
         df_ind = _compute_indicators_for_df(ohlcv)
         df_ind = df_ind.dropna(subset=["rsi", "macd", "macd_signal"])
 
-        rows: List[Dict] = []
-        for idx, r in df_ind.iterrows():
-            rows.append({
-                "symbol_id": symbol_id,
-                "date": idx.date().isoformat(),
-                "timeframe": tf,
-                "rsi": float(r["rsi"]),
-                "macd": float(r["macd"]),
-                "macd_signal": float(r["macd_signal"]),
-                "macd_hist": float(r["macd_hist"]),
-                "stoch_k": float(r["stoch_k"]),
-                "stoch_d": float(r["stoch_d"]),
-                "adx": float(r["adx"]),
-                "cci": float(r["cci"]),
-                "sma": float(r["sma"]),
-                "ema": float(r["ema"]),
-                "wma": float(r["wma"]),
-                "bb_upper": float(r["bb_upper"]),
-                "bb_middle": float(r["bb_middle"]),
-                "bb_lower": float(r["bb_lower"]),
-                "vol_sma": float(r["vol_sma"]),
-                "signal": _generate_signal(r),
-            })
-
-        if rows:
-            cur.executemany(sql, rows)
-            conn.commit()
-            print(f"[technical] Stored {len(rows)} rows for {symbol} ({tf})")
+        values = df_ind[INDICATOR_COLUMNS].to_numpy(dtype=np.float64)
+        dates = df_ind.index.strftime("%Y-%m-%d").tolist()
+        signals = _generate_signals(values[:, 0], values[:, 1], values[:, 2]).tolist()
+
+        tf_rows = len(dates)
+        rows.extend(
+            (symbol_id, d, tf, *vals, sig)
+            for d, vals, sig in zip(dates, values.tolist(), signals)
+        )
+
+        if tf_rows:
+            print(f"[technical] Prepared {tf_rows} rows for {symbol} ({tf})")
+
+    return rows
+
+
+def _store_indicator_rows(conn: sqlite3.Connection, symbol: str, rows: List[Tuple]) -> None:
+    """
+    Upsert all rows of a symbol in one transaction.
+    """
+    if not rows:
+        return
+
+    with conn:
+        conn.executemany(INSERT_INDICATORS_SQL, rows)
+    print(f"[technical] Stored {len(rows)} rows for {symbol}")
+
+
+def compute_and_store_indicators_for_symbol(
+    conn: sqlite3.Connection,
+    symbol: str,
+    timeframes: List[str] = None,
+    base_df: pd.DataFrame = None,
+) -> None:
+    """
+    Main entry point:
+    - load OHLCV from daily_data (unless base_df is already loaded)
+    - resample to each timeframe (1D, 1W, 1M)
+    - compute indicators
+    - generate signals
+    - upsert into technical_indicators table
+    """
+    rows = _indicator_rows_for_symbol(conn, symbol, timeframes, base_df)
+    _store_indicator_rows(conn, symbol, rows)
+
+
+def compute_and_store_indicators_for_symbols(
+    conn: sqlite3.Connection,
+    symbols: List[str],
+    timeframes: List[str] = None,
+    max_workers: int = None,
+) -> None:
+    """
+    Same as compute_and_store_indicators_for_symbol for many symbols.
+    OHLCV and symbol ids for all symbols are read up front, then symbols are
+    computed in parallel worker processes (one per CPU by default) that never
+    touch SQLite; conn is the only reader and writer. At most 2 * max_workers
+    symbols are in flight, so only their frames and rows are held in memory.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return
+
+    frames = load_ohlcv_for_symbols(conn, symbols)
+    symbol_ids = fetch_symbol_ids(conn, symbols)
+
+    pending = []
+    for symbol in symbols:
+        if symbol not in frames:
+            print(f"[technical] No OHLCV data for symbol {symbol}")
+        elif symbol not in symbol_ids:
+            print(f"[technical] Symbol {symbol} not found in cryptocurrencies table")
+        else:
+            pending.append(symbol)
+    if not pending:
+        return
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(pending))
+
+    tasks = iter(pending)
+
+    def submit(pool, symbol):
+        # the frame leaves the parent's dict once handed to a worker
+        base_df = frames.pop(symbol)
+        return pool.submit(_indicator_rows, symbol_ids[symbol], symbol, base_df, timeframes)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        in_flight = {}
+        for symbol in islice(tasks, 2 * max_workers):
+            in_flight[submit(pool, symbol)] = symbol
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                symbol = in_flight.pop(future)
+                next_symbol = next(tasks, None)
+                if next_symbol is not None:
+                    in_flight[submit(pool, next_symbol)] = next_symbol
+                _store_indicator_rows(conn, symbol, future.result())
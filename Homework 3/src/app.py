@@ -1,15 +1,83 @@
-from flask import Flask, render_template, request
+from flask import Flask, abort, render_template, request, stream_template, url_for
 import sqlite3
 import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 import json
 
+try:
+    from flask_caching import Cache
+except ImportError:  # optional, pages are rendered uncached without it
+    Cache = None
+
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is used without it
+    orjson = None
+
+from db import connect_readonly
+from search import SEARCH_WHERE, like_params, search_filter
+
 app = Flask(__name__)
 
+# Data only changes when the pipeline runs, so pages may be a minute stale
+CACHE_TIMEOUT = 60
+
+
+class _NoCache:
+    """Stand-in for flask_caching.Cache when it is not installed."""
+
+    def cached(self, *args, **kwargs):
+        return lambda f: f
+
+
+if Cache is not None:
+    cache = Cache(app, config={"CACHE_TYPE": "SimpleCache"})
+else:
+    cache = _NoCache()
+    print("Flask-Caching is not installed; pages are rendered uncached")
+
 # DB helpers
 
+DB_PATH_CACHE = Path.home() / ".crypto_db_path"
+DB_SEARCH_MAX_DEPTH = 3
+DB_SEARCH_SKIP_DIRS = {"node_modules", "venv", "__pycache__", "site-packages"}
+
+
+def _search_home_for_database(max_depth=DB_SEARCH_MAX_DEPTH):
+    """Breadth-first search for crypto.db under home, skipping hidden dirs."""
+    level = [str(Path.home())]
+    for _ in range(max_depth + 1):
+        next_level = []
+        for directory in level:
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.name == "crypto.db" and entry.is_file():
+                            return entry.path
+                        if (
+                            entry.is_dir(follow_symlinks=False)
+                            and not entry.name.startswith(".")
+                            and entry.name not in DB_SEARCH_SKIP_DIRS
+                        ):
+                            next_level.append(entry.path)
+            except OSError:
+                continue
+        level = next_level
+    return None
+
+
 def find_database():
     """Automatically find crypto.db in a few common locations."""
+    env_path = os.environ.get("CRYPTO_DB_PATH")
+    if env_path and os.path.exists(env_path):
+        print(f"Database found at: {env_path}")
+        return env_path
+
     possible_paths = [
         "./crypto.db",
         "../crypto.db",
@@ -20,11 +88,23 @@ def find_database():
             print(f"Database found at: {path}")
             return path
 
-    home = Path.home()
-    for db_path in home.rglob("crypto.db"):
-        if os.path.exists(db_path):
-            print(f"Database found at: {db_path}")
-            return str(db_path)
+    # Path remembered from an earlier search
+    try:
+        cached_path = DB_PATH_CACHE.read_text(encoding="utf-8").strip()
+    except OSError:
+        cached_path = ""
+    if cached_path and os.path.exists(cached_path):
+        print(f"Database found at: {cached_path}")
+        return cached_path
+
+    db_path = _search_home_for_database()
+    if db_path:
+        print(f"Database found at: {db_path}")
+        try:
+            DB_PATH_CACHE.write_text(db_path, encoding="utf-8")
+        except OSError:
+            pass
+        return db_path
 
     print("Database not found!")
     return None
@@ -33,13 +113,132 @@ def find_database():
 DB_PATH = find_database()
 
 
+# Read-only connections shared by the server threads
+DB_POOL_SIZE = 8
+# seconds to wait for a free connection before answering 503
+DB_POOL_TIMEOUT = 10
+_pool = queue.Queue(maxsize=DB_POOL_SIZE)
+_pool_lock = threading.Lock()
+_pool_opened = 0
+_checked_out = set()
+
+
+def _take_connection():
+    global _pool_opened
+    try:
+        return _pool.get_nowait()
+    except queue.Empty:
+        pass
+    with _pool_lock:
+        if _pool_opened < DB_POOL_SIZE:
+            # count it only once it is open, a failed connect frees the slot
+            conn = connect_readonly(DB_PATH)
+            _pool_opened += 1
+            return conn
+    try:
+        return _pool.get(timeout=DB_POOL_TIMEOUT)
+    except queue.Empty:
+        abort(503, "All database connections are busy, try again shortly.")
+
+
 def get_db_connection():
-    """Return a sqlite3 connection with row access by column name."""
-    if DB_PATH and os.path.exists(DB_PATH):
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        return conn
-    return None
+    """Take a read-only sqlite3 connection from the pool (rows by column name)."""
+    if not (DB_PATH and os.path.exists(DB_PATH)):
+        return None
+    conn = _take_connection()
+    with _pool_lock:
+        _checked_out.add(conn)
+    return conn
+
+
+def release_db_connection(conn):
+    """Put a connection back into the pool; None and repeat calls are ignored."""
+    if conn is None:
+        return
+    with _pool_lock:
+        if conn not in _checked_out:
+            return
+        _checked_out.remove(conn)
+    _pool.put(conn)
+
+
+@contextmanager
+def db_connection():
+    """Borrow a pooled connection for a with-block; yields None without a DB."""
+    conn = get_db_connection()
+    try:
+        yield conn
+    finally:
+        release_db_connection(conn)
+
+
+# Statements below read latest_daily_data (one row per symbol, kept by
+# Filter 3). Databases filled before that table existed get the same rows
+# derived from daily_data until init_db runs again.
+LATEST_DAILY_TABLE = "latest_daily_data"
+LATEST_DAILY_FALLBACK = """(
+    SELECT d.*
+    FROM daily_data d
+    JOIN (
+        SELECT symbol_id, MAX(date) AS latest_date
+        FROM daily_data
+        GROUP BY symbol_id
+    ) m ON m.symbol_id = d.symbol_id AND m.latest_date = d.date
+)"""
+
+
+def _latest_statements(template, **kwargs):
+    """(current, fallback) forms of a statement with a {latest} source."""
+    return (
+        template.format(latest=LATEST_DAILY_TABLE, **kwargs),
+        template.format(latest=LATEST_DAILY_FALLBACK, **kwargs),
+    )
+
+
+def _execute_latest(cur, statements, params=()):
+    """Run the latest_daily_data form, or the fallback if the table is missing."""
+    current, fallback = statements
+    try:
+        return cur.execute(current, params)
+    except sqlite3.OperationalError as exc:
+        if LATEST_DAILY_TABLE not in str(exc):
+            raise
+        return cur.execute(fallback, params)
+
+
+# MAX(date) over one row per symbol skips the full daily_data scan
+# (no index leads with date)
+LAST_UPDATE_SQL = _latest_statements("SELECT MAX(date) AS last_date FROM {latest}")
+
+
+# (value, expires_at) on the time.monotonic() clock
+_last_update_cache = (None, 0.0)
+
+
+def _latest_date():
+    with db_connection() as conn:
+        if not conn:
+            return None
+        row = _execute_latest(conn, LAST_UPDATE_SQL).fetchone()
+    return row["last_date"] if row and row["last_date"] else None
+
+
+def get_last_update():
+    """Latest date in daily_data for the sidebar, or "Never"."""
+    global _last_update_cache
+    value, expires_at = _last_update_cache
+    now = time.monotonic()
+    if value is None or now >= expires_at:
+        value = _latest_date()
+        # None is not cached, so "no data yet" is re-checked on the next call
+        if value is not None:
+            _last_update_cache = (value, now + CACHE_TIMEOUT)
+    return value or "Never"
+
+
+def _is_cacheable(rv):
+    """Only cache fully rendered pages, not (body, status) error tuples."""
+    return not isinstance(rv, tuple)
 
 
 # Make DB path available in all templates as {{ db_path }}
@@ -49,32 +248,43 @@ def inject_globals():
 
 
 
+# (threshold, suffix) checked from largest to smallest
+_NUMBER_UNITS = ((1e9, "B"), (1e6, "M"), (1e3, "K"))
+
+
 def format_number(num):
     """Format large numbers into K / M / B with a $ sign."""
     if num is None:
         return "N/A"
     try:
         num = float(num)
-        if num >= 1e9:
-            return f"${num/1e9:.2f}B"
-        elif num >= 1e6:
-            return f"${num/1e6:.2f}M"
-        elif num >= 1e3:
-            return f"${num/1e3:.2f}K"
-        return f"${num:.2f}"
     except Exception:
         return "N/A"
+    for limit, suffix in _NUMBER_UNITS:
+        if num >= limit:
+            return f"${num / limit:.2f}{suffix}"
+    return f"${num:.2f}"
 
 
 app.jinja_env.filters["format_number"] = format_number
 
 
+# Prebuilt formatters for the precisions the templates use
+_FLOAT_FORMATTERS = {
+    2: "{:.2f}".format,
+    4: "{:.4f}".format,
+}
+
+
 def format_float(value, digits=4):
     """Format a float with a fixed number of decimal places."""
     if value is None:
         return ""
     try:
-        return f"{float(value):.{int(digits)}f}"
+        formatter = _FLOAT_FORMATTERS.get(digits)
+        if formatter is None:
+            return f"{float(value):.{int(digits)}f}"
+        return formatter(float(value))
     except (TypeError, ValueError):
         return ""
 
@@ -82,6 +292,54 @@ def format_float(value, digits=4):
 app.jinja_env.filters["format_float"] = format_float
 
 
+@lru_cache(maxsize=4096)
+def _url_for_cached(script_root, endpoint, values):
+    return url_for(endpoint, **dict(values))
+
+
+def cached_url_for(endpoint, **values):
+    """
+    url_for for templates, memoized per (script root, endpoint, args).
+    External / scheme / anchor URLs and unhashable args skip the cache.
+    """
+    if any(key in values for key in ("_external", "_scheme", "_anchor", "_method")):
+        return url_for(endpoint, **values)
+    key = tuple(sorted(values.items()))
+    try:
+        return _url_for_cached(request.script_root, endpoint, key)
+    except TypeError:
+        return url_for(endpoint, **values)
+
+
+app.jinja_env.globals["url_for"] = cached_url_for
+
+
+# Route SQL lives in constants so every request reuses the same
+# prepared statement from the connection's statement cache
+
+DASHBOARD_STATS_SQL = _latest_statements("""
+    SELECT
+        (SELECT COUNT(*) FROM cryptocurrencies)            AS total_symbols,
+        (SELECT COUNT(*) FROM daily_data)                  AS total_data_points,
+        (SELECT AVG(volume) FROM daily_data WHERE volume > 0) AS avg_volume,
+        (SELECT MAX(date) FROM {latest})                   AS last_date
+""")
+
+TOP_SYMBOLS_SQL = """
+    SELECT 
+        c.symbol, 
+        c.base_asset, 
+        c.quote_asset,
+        AVG(d.volume) AS avg_volume,
+        MAX(d.volume) AS max_volume
+    FROM cryptocurrencies c
+    JOIN daily_data d ON d.symbol_id = c.id
+    GROUP BY c.id
+    ORDER BY avg_volume DESC
+    LIMIT 10
+"""
+
+
 @app.route("/")
 def dashboard():
     conn = get_db_connection()
@@ -91,41 +349,20 @@ def dashboard():
     try:
         cur = conn.cursor()
 
-        # Total symbols
-        cur.execute("SELECT COUNT(*) AS count FROM cryptocurrencies")
-        total_symbols = cur.fetchone()["count"]
-
-        # Total data points
-        cur.execute("SELECT COUNT(*) AS count FROM daily_data")
-        total_data_points = cur.fetchone()["count"]
-
-        # Average volume for non-zero days
-        cur.execute("SELECT AVG(volume) AS avg_volume FROM daily_data WHERE volume > 0")
+        # Totals, average volume for non-zero days and last update date
+        _execute_latest(cur, DASHBOARD_STATS_SQL)
         row = cur.fetchone()
-        avg_volume = row["avg_volume"] if row and row["avg_volume"] is not None else 0
-
-        # Last update date
-        cur.execute("SELECT MAX(date) AS last_date FROM daily_data")
-        row = cur.fetchone()
-        last_update = row["last_date"] if row and row["last_date"] else "Never"
+        total_symbols = row["total_symbols"]
+        total_data_points = row["total_data_points"]
+        avg_volume = row["avg_volume"] if row["avg_volume"] is not None else 0
+        last_update = row["last_date"] if row["last_date"] else "Never"
 
         # Top 10 symbols by avg volume
-        cur.execute("""
-            SELECT 
-                c.symbol, 
-                c.base_asset, 
-                c.quote_asset,
-                (SELECT AVG(volume) FROM daily_data WHERE symbol_id = c.id) AS avg_volume,
-                (SELECT MAX(volume) FROM daily_data WHERE symbol_id = c.id) AS max_volume
-            FROM cryptocurrencies c
-            WHERE EXISTS (SELECT 1 FROM daily_data WHERE symbol_id = c.id)
-            ORDER BY avg_volume DESC
-            LIMIT 10
-        """)
+        cur.execute(TOP_SYMBOLS_SQL)
         top_symbols = cur.fetchall()
 
     finally:
-        conn.close()
+        release_db_connection(conn)
 
     return render_template(
         "dashboard.html",
@@ -137,7 +374,47 @@ def dashboard():
     )
 
 
+SYMBOLS_SELECT_SQL = """
+    SELECT
+        c.id,
+        c.symbol,
+        c.base_asset,
+        c.quote_asset,
+        c.is_active,
+        l.date,
+        l.open,
+        l.high,
+        l.low,
+        l.close,
+        l.volume,
+        l.last_price_24h,
+        l.volume_24h,
+        l.high_24h,
+        l.low_24h,
+        l.liquidity
+    FROM cryptocurrencies c
+    JOIN {latest} l ON l.symbol_id = c.id
+"""
+
+SYMBOLS_PAGE_SQL = _latest_statements(SYMBOLS_SELECT_SQL + """
+    ORDER BY c.symbol
+    LIMIT ? OFFSET ?
+""")
+
+SYMBOLS_COUNT_SQL = _latest_statements("SELECT COUNT(*) AS cnt FROM {latest}")
+
+SYMBOLS_SEARCH_SQL = SYMBOLS_SELECT_SQL + """
+    WHERE {where}
+    ORDER BY c.symbol
+"""
+SEARCH_STATEMENTS = {
+    kind: _latest_statements(SYMBOLS_SEARCH_SQL, where=where)
+    for kind, where in SEARCH_WHERE.items()
+}
+
+
 @app.route("/symbols")
+@cache.cached(timeout=CACHE_TIMEOUT, query_string=True, response_filter=_is_cacheable)
 def symbols_list():
     conn = get_db_connection()
     if not conn:
@@ -154,40 +431,14 @@ def symbols_list():
 
         if q:
             # SEARCH MODE: look across ALL symbols 
-            like = f"%{q.upper()}%"
-
-            cur.execute("""
-                WITH latest AS (
-                    SELECT symbol_id, MAX(date) AS latest_date
-                    FROM daily_data
-                    GROUP BY symbol_id
-                )
-                SELECT
-                    c.id,
-                    c.symbol,
-                    c.base_asset,
-                    c.quote_asset,
-                    c.is_active,
-                    d.date,
-                    d.open,
-                    d.high,
-                    d.low,
-                    d.close,
-                    d.volume,
-                    d.last_price_24h,
-                    d.volume_24h,
-                    d.high_24h,
-                    d.low_24h,
-                    d.liquidity
-                FROM cryptocurrencies c
-                JOIN latest l ON l.symbol_id = c.id
-                JOIN daily_data d
-                  ON d.symbol_id = c.id AND d.date = l.latest_date
-                WHERE UPPER(c.symbol)      LIKE ?
-                   OR UPPER(c.base_asset)  LIKE ?
-                   OR UPPER(c.quote_asset) LIKE ?
-                ORDER BY c.symbol
-            """, (like, like, like))
+            kind, params = search_filter(q)
+            try:
+                _execute_latest(cur, SEARCH_STATEMENTS[kind], params)
+            except sqlite3.OperationalError:
+                if kind != "substring":
+                    raise
+                # database from before cc_fts existed: no trigram index yet
+                _execute_latest(cur, SEARCH_STATEMENTS["like"], like_params(q))
 
             symbols = cur.fetchall()
             total_symbols = len(symbols)
@@ -200,43 +451,12 @@ def symbols_list():
 
         else:
             # NORMAL MODE: paginated list of all symbols 
-            cur.execute("""
-                WITH latest AS (
-                    SELECT symbol_id, MAX(date) AS latest_date
-                    FROM daily_data
-                    GROUP BY symbol_id
-                )
-                SELECT
-                    c.id,
-                    c.symbol,
-                    c.base_asset,
-                    c.quote_asset,
-                    c.is_active,
-                    d.date,
-                    d.open,
-                    d.high,
-                    d.low,
-                    d.close,
-                    d.volume,
-                    d.last_price_24h,
-                    d.volume_24h,
-                    d.high_24h,
-                    d.low_24h,
-                    d.liquidity
-                FROM cryptocurrencies c
-                JOIN latest l ON l.symbol_id = c.id
-                JOIN daily_data d
-                  ON d.symbol_id = c.id AND d.date = l.latest_date
-                ORDER BY c.symbol
-                LIMIT ? OFFSET ?
-            """, (page_size, offset))
+            _execute_latest(cur, SYMBOLS_PAGE_SQL, (page_size, offset))
             symbols = cur.fetchall()
 
             # total count for pagination
-            cur.execute("""
-                SELECT COUNT(DISTINCT symbol_id) AS cnt
-                FROM daily_data
-            """)
+            # one row per listed symbol, so no scan over daily_data
+            _execute_latest(cur, SYMBOLS_COUNT_SQL)
             row_cnt = cur.fetchone()
             total_symbols = row_cnt["cnt"] if row_cnt and row_cnt["cnt"] is not None else 0
 
@@ -245,13 +465,11 @@ def symbols_list():
             has_prev = page > 1
             has_next = page < total_pages
 
-        # Sidebar last_update (same for both modes)
-        cur.execute("SELECT MAX(date) AS last_date FROM daily_data")
-        row_last = cur.fetchone()
-        last_update = row_last["last_date"] if row_last and row_last["last_date"] else "Never"
-
     finally:
-        conn.close()
+        release_db_connection(conn)
+
+    # Sidebar last_update (same for both modes)
+    last_update = get_last_update()
 
     return render_template(
         "symbols.html",
@@ -265,33 +483,72 @@ def symbols_list():
     )
 
 
+SYMBOL_META_SQL = """
+    SELECT id, base_asset, quote_asset, is_active
+    FROM cryptocurrencies
+    WHERE symbol = ?
+"""
+
+SYMBOL_ID_SQL = "SELECT id FROM cryptocurrencies WHERE symbol = ?"
+
+HISTORY_SQL = """
+    SELECT
+        date,
+        open,
+        high,
+        low,
+        close,
+        volume,
+        last_price_24h,
+        volume_24h,
+        high_24h,
+        low_24h,
+        liquidity
+    FROM daily_data
+    WHERE symbol_id = ?
+    ORDER BY date
+"""
+
+
+HISTORY_FETCH_SIZE = 512
+
+
+def iter_history(cur, first_row=None):
+    """Yield history rows in fetchmany batches instead of one fetchall list."""
+    if first_row is None:
+        return
+    yield first_row
+    while True:
+        batch = cur.fetchmany(HISTORY_FETCH_SIZE)
+        if not batch:
+            return
+        yield from batch
+
+
 @app.route("/symbols/<symbol>/history")
 def symbol_history(symbol):
+    # before borrowing a connection: the lookup may need one of its own
+    last_update = get_last_update()
+
     conn = get_db_connection()
     if not conn:
         return "Database not available", 500
 
+    # The streamed page keeps reading the cursor after this function returns,
+    # so the connection goes back to the pool when the response closes.
+    streaming = False
     try:
         cur = conn.cursor()
 
         # Find symbol_id
-        cur.execute("""
-            SELECT id, base_asset, quote_asset, is_active
-            FROM cryptocurrencies
-            WHERE symbol = ?
-        """, (symbol,))
+        cur.execute(SYMBOL_META_SQL, (symbol,))
         sym_row = cur.fetchone()
         if not sym_row:
-            # also get last_update for sidebar
-            cur.execute("SELECT MAX(date) AS last_date FROM daily_data")
-            row_last = cur.fetchone()
-            last_update = row_last["last_date"] if row_last and row_last["last_date"] else "Never"
-
-            conn.close()
             return render_template(
                 "symbol_history.html",
                 symbol=symbol,
                 history=[],
+                has_history=False,
                 last_update=last_update,
                 not_found=True,
                 meta=None,
@@ -304,42 +561,54 @@ def symbol_history(symbol):
             "is_active": sym_row["is_active"],
         }
 
-        # Fetch full daily history for that symbol
-        cur.execute("""
-            SELECT
-                date,
-                open,
-                high,
-                low,
-                close,
-                volume,
-                last_price_24h,
-                volume_24h,
-                high_24h,
-                low_24h,
-                liquidity
-            FROM daily_data
-            WHERE symbol_id = ?
-            ORDER BY date
-        """, (symbol_id,))
-        history = cur.fetchall()
-
-        # Sidebar last_update
-        cur.execute("SELECT MAX(date) AS last_date FROM daily_data")
-        row_last = cur.fetchone()
-        last_update = row_last["last_date"] if row_last and row_last["last_date"] else "Never"
+        # Full daily history for that symbol, streamed into the template
+        cur.execute(HISTORY_SQL, (symbol_id,))
+        first_row = cur.fetchone()
+
+        response = app.response_class(stream_template(
+            "symbol_history.html",
+            symbol=symbol,
+            history=iter_history(cur, first_row),
+            has_history=first_row is not None,
+            last_update=last_update,
+            not_found=False,
+            meta=meta,
+        ))
+        response.call_on_close(lambda: release_db_connection(conn))
+        streaming = True
+        return response
 
     finally:
-        conn.close()
-
-    return render_template(
-        "symbol_history.html",
-        symbol=symbol,
-        history=history,
-        last_update=last_update,
-        not_found=False,
-        meta=meta,
-    )
+        if not streaming:
+            release_db_connection(conn)
+
+
+TECHNICAL_SQL = """
+    SELECT
+        date,
+        timeframe,
+        rsi,
+        macd,
+        macd_signal,
+        macd_hist,
+        stoch_k,
+        stoch_d,
+        adx,
+        cci,
+        sma,
+        ema,
+        wma,
+        bb_middle,
+        bb_upper,
+        bb_lower,
+        vol_sma,
+        signal
+    FROM technical_indicators
+    WHERE symbol_id = ?
+      AND timeframe = '1D'
+    ORDER BY date DESC
+    LIMIT 200
+"""
 
 
 @app.route("/symbols/<symbol>/technical")
@@ -352,48 +621,19 @@ def symbol_technical(symbol):
         cur = conn.cursor()
 
         # Find symbol_id from cryptocurrencies
-        cur.execute(
-            "SELECT id FROM cryptocurrencies WHERE symbol = ?",
-            (symbol,),
-        )
+        cur.execute(SYMBOL_ID_SQL, (symbol,))
         row = cur.fetchone()
         if not row:
-            conn.close()
             return f"No such symbol in database: {symbol}", 404
 
         symbol_id = row["id"]
 
         # Pull technical indicators for that symbol_id
-        cur.execute("""
-            SELECT
-                date,
-                timeframe,
-                rsi,
-                macd,
-                macd_signal,
-                macd_hist,
-                stoch_k,
-                stoch_d,
-                adx,
-                cci,
-                sma,
-                ema,
-                wma,
-                bb_middle,
-                bb_upper,
-                bb_lower,
-                vol_sma,
-                signal
-            FROM technical_indicators
-            WHERE symbol_id = ?
-              AND timeframe = '1D'
-            ORDER BY date DESC
-            LIMIT 200
-        """, (symbol_id,))
+        cur.execute(TECHNICAL_SQL, (symbol_id,))
         rows = cur.fetchall()
 
     finally:
-        conn.close()
+        release_db_connection(conn)
 
     if not rows:
         message = (
@@ -411,6 +651,34 @@ def symbol_technical(symbol):
     )
 
 
+SENTIMENT_LATEST_SQL = """
+    SELECT *
+    FROM sentiment_analysis
+    WHERE symbol_id = ?
+    ORDER BY analysis_date DESC
+    LIMIT 1
+"""
+
+SENTIMENT_HISTORY_SQL = """
+    SELECT analysis_date, overall_sentiment_score, sentiment_signal
+    FROM sentiment_analysis
+    WHERE symbol_id = ?
+    ORDER BY analysis_date DESC
+    LIMIT 30
+"""
+
+SENTIMENT_RECENT_SQL = """
+    SELECT analysis_date AS date,
+           news_positive_count,
+           news_negative_count,
+           news_neutral_count
+    FROM sentiment_analysis
+    WHERE symbol_id = ?
+    ORDER BY analysis_date DESC
+    LIMIT 7
+"""
+
+
 @app.route("/symbols/<symbol>/sentiment")
 def symbol_sentiment(symbol):
     """Display sentiment analysis for a symbol"""
@@ -422,11 +690,7 @@ def symbol_sentiment(symbol):
         cur = conn.cursor()
         
         # Get symbol info
-        cur.execute("""
-            SELECT id, base_asset, quote_asset
-            FROM cryptocurrencies
-            WHERE symbol = ?
-        """, (symbol,))
+        cur.execute(SYMBOL_META_SQL, (symbol,))
         sym = cur.fetchone()
         if not sym:
             return f"Symbol {symbol} not found", 404
@@ -434,40 +698,19 @@ def symbol_sentiment(symbol):
         symbol_id = sym["id"]
         
         # Get latest sentiment analysis
-        cur.execute("""
-            SELECT *
-            FROM sentiment_analysis
-            WHERE symbol_id = ?
-            ORDER BY analysis_date DESC
-            LIMIT 1
-        """, (symbol_id,))
+        cur.execute(SENTIMENT_LATEST_SQL, (symbol_id,))
         sentiment = cur.fetchone()
         
         # Get sentiment history for chart
-        cur.execute("""
-            SELECT analysis_date, overall_sentiment_score, sentiment_signal
-            FROM sentiment_analysis
-            WHERE symbol_id = ?
-            ORDER BY analysis_date DESC
-            LIMIT 30
-        """, (symbol_id,))
+        cur.execute(SENTIMENT_HISTORY_SQL, (symbol_id,))
         sentiment_history = cur.fetchall()
         
         # Get recent sentiment summary (last 7 days)
-        cur.execute("""
-            SELECT analysis_date AS date,
-                   news_positive_count,
-                   news_negative_count,
-                   news_neutral_count
-            FROM sentiment_analysis
-            WHERE symbol_id = ?
-            ORDER BY analysis_date DESC
-            LIMIT 7
-        """, (symbol_id,))
+        cur.execute(SENTIMENT_RECENT_SQL, (symbol_id,))
         recent_sentiment = cur.fetchall()
         
     finally:
-        conn.close()
+        release_db_connection(conn)
     
     return render_template(
         "symbol_sentiment.html",
@@ -480,6 +723,25 @@ def symbol_sentiment(symbol):
     )
 
 
+LSTM_PREDICTIONS_SQL = """
+    SELECT
+        prediction_date,
+        timeframe,
+        horizon_days,
+        lookback_days,
+        predicted_close,
+        rmse,
+        mape,
+        r2,
+        model_name,
+        created_at
+    FROM lstm_predictions
+    WHERE symbol_id = ?
+    ORDER BY prediction_date DESC
+    LIMIT 300
+"""
+
+
 @app.route("/symbols/<symbol>/lstm")
 def symbol_lstm(symbol):
     conn = get_db_connection()
@@ -490,11 +752,7 @@ def symbol_lstm(symbol):
         cur = conn.cursor()
 
         # Find the symbol_id, base and quote
-        cur.execute("""
-            SELECT id, base_asset, quote_asset
-            FROM cryptocurrencies
-            WHERE symbol = ?
-        """, (symbol,))
+        cur.execute(SYMBOL_META_SQL, (symbol,))
         sym = cur.fetchone()
         if not sym:
             return f"Symbol {symbol} not found", 404
@@ -502,27 +760,11 @@ def symbol_lstm(symbol):
         symbol_id = sym["id"]
 
         # Load LSTM prediction rows for that symbol
-        cur.execute("""
-            SELECT
-                prediction_date,
-                timeframe,
-                horizon_days,
-                lookback_days,
-                predicted_close,
-                rmse,
-                mape,
-                r2,
-                model_name,
-                created_at
-            FROM lstm_predictions
-            WHERE symbol_id = ?
-            ORDER BY prediction_date DESC
-            LIMIT 300
-        """, (symbol_id,))
+        cur.execute(LSTM_PREDICTIONS_SQL, (symbol_id,))
         predictions = cur.fetchall()
 
     finally:
-        conn.close()
+        release_db_connection(conn)
 
     return render_template(
         "symbol_lstm.html",
@@ -534,6 +776,58 @@ def symbol_lstm(symbol):
 
 
 
+# JSON API for chart clients: same queries as the pages, no Jinja
+
+def _dumps(payload):
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def _json_rows(cur, rows):
+    """Column names once plus one plain list per row, smaller than dicts."""
+    return {
+        "columns": [col[0] for col in cur.description],
+        "rows": [tuple(row) for row in rows],
+    }
+
+
+def _json_response(payload, status=200):
+    return app.response_class(_dumps(payload), status=status, mimetype="application/json")
+
+
+def _symbol_rows_json(symbol, sql):
+    conn = get_db_connection()
+    if not conn:
+        return _json_response({"error": "Database not available"}, 500)
+
+    try:
+        cur = conn.cursor()
+        cur.execute(SYMBOL_ID_SQL, (symbol,))
+        row = cur.fetchone()
+        if not row:
+            return _json_response({"error": f"Symbol {symbol} not found"}, 404)
+
+        cur.execute(sql, (row["id"],))
+        payload = _json_rows(cur, cur.fetchall())
+    finally:
+        release_db_connection(conn)
+
+    payload["symbol"] = symbol
+    return _json_response(payload)
+
+
+@app.route("/api/symbols/<symbol>/technical")
+def api_symbol_technical(symbol):
+    return _symbol_rows_json(symbol, TECHNICAL_SQL)
+
+
+@app.route("/api/symbols/<symbol>/lstm")
+def api_symbol_lstm(symbol):
+    return _symbol_rows_json(symbol, LSTM_PREDICTIONS_SQL)
+
+
+
 
 if __name__ == "__main__":
 
@@ -542,19 +836,19 @@ if __name__ == "__main__":
     if DB_PATH:
         print(f"Database found at: {DB_PATH}")
 
-        conn = get_db_connection()
-        if conn:
-            cur = conn.cursor()
-            cur.execute("SELECT COUNT(*) AS count FROM cryptocurrencies")
-            symbol_count = cur.fetchone()["count"]
+        with db_connection() as conn:
+            if conn:
+                cur = conn.cursor()
+                cur.execute("SELECT COUNT(*) AS count FROM cryptocurrencies")
+                symbol_count = cur.fetchone()["count"]
 
-            cur.execute("SELECT COUNT(*) AS count FROM daily_data")
-            data_count = cur.fetchone()["count"]
+                cur.execute("SELECT COUNT(*) AS count FROM daily_data")
+                data_count = cur.fetchone()["count"]
 
-            cur.execute("SELECT MIN(date) AS min_date, MAX(date) AS max_date FROM daily_data")
-            date_range = cur.fetchone()
-            conn.close()
+                cur.execute("SELECT MIN(date) AS min_date, MAX(date) AS max_date FROM daily_data")
+                date_range = cur.fetchone()
 
+        if conn:
             print("Database Stats:")
             print(f"   • Total Symbols: {symbol_count}")
             print(f"   • Total Data Points: {data_count}")
@@ -26,6 +26,17 @@ TEN_YEARS_DAYS   = 365 * YEARS_OF_HISTORY
 
 REQUEST_TIMEOUT        = 30  
 MAX_KLINES_PER_REQUEST = 1000  
+HTTP_POOL_SIZE         = 32    # keep-alive connections kept by the session
+HTTP_RETRIES           = 5
+
+
+COMMIT_EVERY_N_SYMBOLS = 50    # Filter 3 commits once per this many symbols
+DOWNLOAD_WORKERS       = 16    # concurrent kline downloads in Filter 3
+
+
+# Binance request weight budget per minute (X-MBX-USED-WEIGHT-1M header)
+WEIGHT_LIMIT_1M     = 6000
+WEIGHT_SAFETY_RATIO = 0.9      # pause once this share of the budget is used
 
 
 ONE_DAY = timedelta(days=1)
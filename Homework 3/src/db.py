@@ -1,24 +1,82 @@
 import sqlite3
+from pathlib import Path
+
 import config
 
 def load_sql(filename: str) -> str:
     path = config.SQL_DIR / filename
     return path.read_text(encoding="utf-8")
 
+# WAL + synchronous=NORMAL: commits no longer fsync the whole journal
+CONNECTION_PRAGMAS = (
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "cache_size=-65536",
+)
+
+# Stay below SQLite's default limit of 999 bound variables per IN list
+SQL_IN_CHUNK_SIZE = 900
+
+# sqlite3 reuses a prepared statement when the same SQL string comes back
+STATEMENT_CACHE_SIZE = 256
+
+def init_connection(conn, readonly=False):
+    # journal_mode is stored in the db file, so read-only handles skip it
+    if not readonly:
+        conn.execute("PRAGMA journal_mode=WAL")
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(f"PRAGMA {pragma}")
+    return conn
+
 def get_connection():
-    conn = sqlite3.connect(config.DB_PATH)
+    conn = sqlite3.connect(config.DB_PATH, cached_statements=STATEMENT_CACHE_SIZE)
     conn.row_factory = sqlite3.Row
-    return conn
+    return init_connection(conn)
+
+def connect_readonly(path):
+    # as_uri() escapes spaces etc.; check_same_thread=False lets the
+    # connection be handed across threads
+    uri = Path(path).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(
+        uri, uri=True, check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    conn.row_factory = sqlite3.Row
+    return init_connection(conn, readonly=True)
+
+def table_exists(conn, name):
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = ?", (name,)
+    ).fetchone()
+    return row is not None
+
+SELECT_IDS_BY_SYMBOL_SQL = "SELECT id, symbol FROM cryptocurrencies WHERE symbol IN ({})"
+
+def fetch_symbol_ids(cur, symbols):
+    # {symbol: id} for the given names, one IN query per chunk
+    ids = {}
+    for i in range(0, len(symbols), SQL_IN_CHUNK_SIZE):
+        chunk = symbols[i:i + SQL_IN_CHUNK_SIZE]
+        sql = SELECT_IDS_BY_SYMBOL_SQL.format(",".join("?" * len(chunk)))
+        for symbol_id, symbol in cur.execute(sql, chunk):
+            ids[symbol] = symbol_id
+    return ids
 
 def init_db():
     conn = get_connection()
+    fts_is_new = not table_exists(conn, "cc_fts")
     tables_sql = load_sql("create_tables.sql")
     conn.executescript(tables_sql)
+    if fts_is_new:
+        # index symbols stored before cc_fts existed; the triggers keep
+        # it in sync from here on
+        conn.execute(load_sql("rebuild_cc_fts.sql"))
     conn.commit()
     conn.close()
 
 
 UPSERT_SYMBOL_SQL     = load_sql("upsert_symbol.sql")
-SELECT_LAST_DATE_SQL  = load_sql("select_last_date_symbol.sql")
+SELECT_LAST_DATES_SQL = load_sql("select_last_dates.sql")
 INSERT_DAILY_DATA_SQL = load_sql("insert_daily_data.sql")
-SELECT_BY_ID_CRYPTO_SQL = load_sql("select_by_id_cryptocurrencies.sql")
\ No newline at end of file
+UPSERT_LATEST_DAILY_DATA_SQL = load_sql("upsert_latest_daily_data.sql")
@@ -1,5 +1,5 @@
 import config
-from db import UPSERT_SYMBOL_SQL, SELECT_BY_ID_CRYPTO_SQL
+from db import UPSERT_SYMBOL_SQL, fetch_symbol_ids
 from http_client import fetch_spot_symbols, fetch_24h_tickers
 
 
@@ -92,21 +92,16 @@ def filter_1_get_symbols(conn, max_symbols=None):
 
     cur = conn.cursor()
 
-
+    # Deactivate all, then upsert top N (sets is_active=1) in one transaction
     cur.execute("UPDATE cryptocurrencies SET is_active = 0")
+    cur.executemany(
+        UPSERT_SYMBOL_SQL,
+        [(sym["symbol"], sym["base_asset"], sym["quote_asset"]) for sym in top_active],
+    )
 
-    # Upsert top N symbols
+    ids = fetch_symbol_ids(cur, [sym["symbol"] for sym in top_active])
     for sym in top_active:
-        # UPSERT sets is_active=1 for the symbol
-        cur.execute(
-            UPSERT_SYMBOL_SQL,
-            (sym["symbol"], sym["base_asset"], sym["quote_asset"]),
-        )
-
-    
-        cur.execute(SELECT_BY_ID_CRYPTO_SQL, (sym["symbol"],))
-        row = cur.fetchone()
-        sym["symbol_id"] = row["id"]
+        sym["symbol_id"] = ids[sym["symbol"]]
 
     conn.commit()
 
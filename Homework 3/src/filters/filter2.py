@@ -1,6 +1,6 @@
 from datetime import date, timedelta
 import config
-from db import SELECT_LAST_DATE_SQL
+from db import SELECT_LAST_DATES_SQL
 
 
 def filter_2_check_dates(symbols_iter, conn):
@@ -9,26 +9,27 @@ def filter_2_check_dates(symbols_iter, conn):
     - Compare existing data (date ranges) in the database.
     - Produce tasks that specify which symbol and date range need to be downloaded.  
     """
-    cur = conn.cursor()
+    # Last available date of every symbol in one query
+    last_dates = {
+        row["symbol_id"]: row["last_date"]
+        for row in conn.execute(SELECT_LAST_DATES_SQL)
+    }
+    end = date.today()
+    history_start = end - timedelta(days=365 * config.YEARS_OF_HISTORY)
 
     for sym in symbols_iter:
         symbol_id = sym["symbol_id"]
         symbol = sym["symbol"]
 
-        # Check last available date in the DB
-        cur.execute(SELECT_LAST_DATE_SQL, (symbol_id,))
-        row = cur.fetchone()
-        last_date_str = row["last_date"]
+        last_date_str = last_dates.get(symbol_id)
 
         if last_date_str is None:
             # No data: we fetch at least last N years
-            end = date.today()
-            start = end - timedelta(days=365 * config.YEARS_OF_HISTORY)
+            start = history_start
         else:
             # Data exists: continue from next day
             last_date = date.fromisoformat(last_date_str)
             start = last_date + timedelta(days=1)
-            end = date.today()
 
         # If there's something to fetch (start <= end)
         if start <= end:
@@ -1,88 +1,135 @@
-from datetime import datetime, timedelta, timezone
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date
+from itertools import islice, repeat
 
-from db import INSERT_DAILY_DATA_SQL
+import numpy as np
+import pandas as pd
+
+import config
+from db import INSERT_DAILY_DATA_SQL, UPSERT_LATEST_DAILY_DATA_SQL
 from http_client import fetch_klines_range
 
 
+MS_PER_DAY = 86_400_000
+EPOCH = date(1970, 1, 1)
+
+# Rows are tuples in insert_daily_data.sql column order
+ROW_COLUMNS = [
+    "symbol_id", "date", "open", "high", "low", "close", "volume",
+    "last_price_24h", "volume_24h", "high_24h", "low_24h", "liquidity",
+]
+PRICE_COLUMNS = [
+    "open", "high", "low", "close", "last_price_24h", "high_24h", "low_24h",
+]
+VOLUME_COLUMNS = ["volume", "volume_24h", "liquidity"]
+
+
+def to_epoch_day(d):
+    """Days since 1970-01-01 for a date."""
+    return (d - EPOCH).days
+
+
+def epoch_days_to_iso(days):
+    """ISO date strings for an array of epoch days, converted in one call."""
+    return np.datetime_as_string(
+        np.asarray(days, dtype=np.int64).astype("datetime64[D]"), unit="D"
+    ).tolist()
+
+
 def normalize_klines(symbol_id, klines):
     """
     Normalize Binance klines to the structure required by insert_daily_data.sql.
+    Returns {date_str: row_tuple}; a later kline for the same date wins.
     """
-    rows_by_date = {}
-
-    for k in klines:
-        open_time_ms = k[0]
-        open_price   = float(k[1])
-        high_price   = float(k[2])
-        low_price    = float(k[3])
-        close_price  = float(k[4])
-        volume       = float(k[5])
-
-        dt = datetime.fromtimestamp(open_time_ms / 1000, tz=timezone.utc)
-        date_str = dt.date().isoformat()
-
-        rows_by_date[date_str] = {
-            "symbol_id": symbol_id,
-            "date": date_str,
-            "open": open_price,
-            "high": high_price,
-            "low": low_price,
-            "close": close_price,
-            "volume": volume,
-            "last_price_24h": close_price,
-            "volume_24h": volume,
-            "high_24h": high_price,
-            "low_24h": low_price,
-            "liquidity": volume,
-        }
-
-    return rows_by_date
+    if not klines:
+        return {}
+
+    # columns: open_time, open, high, low, close, volume
+    ohlcv = np.array([k[:6] for k in klines], dtype=object).astype(np.float64)
+
+    date_strs = epoch_days_to_iso(ohlcv[:, 0].astype(np.int64) // MS_PER_DAY)
+
+    open_price  = ohlcv[:, 1].tolist()
+    high_price  = ohlcv[:, 2].tolist()
+    low_price   = ohlcv[:, 3].tolist()
+    close_price = ohlcv[:, 4].tolist()
+    volume      = ohlcv[:, 5].tolist()
+
+    rows = zip(
+        repeat(symbol_id),
+        date_strs,
+        open_price,
+        high_price,
+        low_price,
+        close_price,
+        volume,
+        close_price,   # last_price_24h
+        volume,        # volume_24h
+        high_price,    # high_24h
+        low_price,     # low_24h
+        volume,        # liquidity
+    )
+    return {row[1]: row for row in rows}
 
 
 def fill_missing_dates(symbol_id, start_date, end_date, rows_by_date):
     """
     Ensure every calendar day in [start_date, end_date] has a row.
     If a date is missing create a synthetic candle from previous close.
+    Days before the first real candle are left out.
     """
-    filled_rows = []
-    current = start_date
-    prev_close = None
-
-    have_dates = set(rows_by_date.keys())
-
-    while current <= end_date:
-        ds = current.isoformat()
-        if ds in have_dates:
-            row = rows_by_date[ds]
-            prev_close = row["close"]
-        else:
-            if prev_close is not None:
-                row = {
-                    "symbol_id": symbol_id,
-                    "date": ds,
-                    "open": prev_close,
-                    "high": prev_close,
-                    "low": prev_close,
-                    "close": prev_close,
-                    "volume": 0.0,
-                    "last_price_24h": prev_close,
-                    "volume_24h": 0.0,
-                    "high_24h": prev_close,
-                    "low_24h": prev_close,
-                    "liquidity": 0.0,
-                }
-            else:
-                row = None
-
-        if row is not None:
-            filled_rows.append(row)
-
-        current += timedelta(days=1)
-
-    return filled_rows
-
-
-def filter_3_fill_data(tasks_iter, conn):
+    days = epoch_days_to_iso(
+        np.arange(to_epoch_day(start_date), to_epoch_day(end_date) + 1)
+    )
+    if not rows_by_date or not days:
+        return []
+
+    df = pd.DataFrame.from_dict(
+        rows_by_date, orient="index", columns=ROW_COLUMNS
+    ).reindex(days)
+
+    missing = df["close"].isna().to_numpy()
+    prev_close = df["close"].ffill()
+
+    # synthetic candle: every price is the previous close, no volume
+    for col in PRICE_COLUMNS:
+        df.loc[missing, col] = prev_close[missing]
+    for col in VOLUME_COLUMNS:
+        df.loc[missing, col] = 0.0
+    df["symbol_id"] = symbol_id
+    df["date"] = days
+
+    # nothing to carry forward before the first real candle
+    df = df[prev_close.notna().to_numpy()]
+    return list(df.itertuples(index=False, name=None))
+
+
+def _download_task(task):
+    """
+    Worker: fetch, normalize and gap-fill one task's klines.
+    Returns (task, rows) and never touches the database.
+    """
+    symbol_id  = task["symbol_id"]
+    symbol     = task["symbol"]
+    start_date = task["start_date"]
+    end_date   = task["end_date"]
+
+    print(f"  [Filter 3] {symbol}: {start_date} → {end_date}")
+
+    # Download klines from Binance
+    klines = fetch_klines_range(symbol, start_date, end_date)
+
+    # Normalize into per-date rows
+    rows_by_date = normalize_klines(symbol_id, klines)
+
+    # Fill any missing calendar dates
+    rows_to_store = fill_missing_dates(
+        symbol_id, start_date, end_date, rows_by_date
+    )
+    return task, rows_to_store
+
+
+def filter_3_fill_data(tasks_iter, conn, max_workers=None):
     """
     Final filter:
     - For each task (symbol_id, symbol, date range):
@@ -90,29 +137,52 @@ def filter_3_fill_data(tasks_iter, conn):
         - normalize them
         - fill missing dates
         - insert/merge into daily_data
+    Downloads run on a thread pool (config.DOWNLOAD_WORKERS threads); this
+    thread is the only one writing to conn. latest_daily_data is refreshed
+    for every stored symbol. Writes are committed once per
+    config.COMMIT_EVERY_N_SYMBOLS symbols (and at the end).
+    At most 2 * max_workers downloads are in flight, so only that many
+    symbols' rows are held in memory. A failed download is logged and skipped.
     """
-    cur = conn.cursor()
-
-    for task in tasks_iter:
-        symbol_id  = task["symbol_id"]
-        symbol     = task["symbol"]
-        start_date = task["start_date"]
-        end_date   = task["end_date"]
+    if max_workers is None:
+        max_workers = config.DOWNLOAD_WORKERS
 
-        print(f"  [Filter 3] {symbol}: {start_date} → {end_date}")
-
-        # Download klines from Binance
-        klines = fetch_klines_range(symbol, start_date, end_date)
+    cur = conn.cursor()
+    pending = 0
 
-        # Normalize into per-date rows
-        rows_by_date = normalize_klines(symbol_id, klines)
+    tasks = iter(tasks_iter)
 
-        # Fill any missing calendar dates
-        rows_to_store = fill_missing_dates(
-            symbol_id, start_date, end_date, rows_by_date
-        )
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        in_flight = {
+            pool.submit(_download_task, task): task
+            for task in islice(tasks, 2 * max_workers)
+        }
 
-        # Insert/update in DB
-        if rows_to_store:
-            cur.executemany(INSERT_DAILY_DATA_SQL, rows_to_store)
-            conn.commit()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = in_flight.pop(future)
+
+                # keep the pool busy with the next task
+                next_task = next(tasks, None)
+                if next_task is not None:
+                    in_flight[pool.submit(_download_task, next_task)] = next_task
+
+                try:
+                    _, rows_to_store = future.result()
+                except Exception as exc:
+                    # one failed symbol must not discard the others' work
+                    print(f"  [Filter 3] {task['symbol']} failed: {exc}")
+                    continue
+
+                # Insert/update in DB
+                if rows_to_store:
+                    cur.executemany(INSERT_DAILY_DATA_SQL, rows_to_store)
+                    cur.execute(UPSERT_LATEST_DAILY_DATA_SQL, (task["symbol_id"],))
+                    pending += 1
+                    if pending >= config.COMMIT_EVERY_N_SYMBOLS:
+                        conn.commit()
+                        pending = 0
+                del rows_to_store
+
+    conn.commit()
@@ -1,20 +1,76 @@
+import threading
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta, timezone
 
 import config
 
 
+# One keep-alive session shared by all threads so TCP/TLS connections are
+# reused; transient errors and 429s are retried with backoff (Retry-After
+# is honored)
+SESSION = requests.Session()
+SESSION.headers.update({"Accept-Encoding": "gzip"})
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=config.HTTP_POOL_SIZE,
+        pool_maxsize=config.HTTP_POOL_SIZE,
+        max_retries=Retry(
+            total=config.HTTP_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+        ),
+    ),
+)
+
+# monotonic time until which requests hold off (request weight nearly spent)
+_resume_at = 0.0
+_weight_lock = threading.Lock()
+
+
+def _wait_for_weight_budget():
+    delay = _resume_at - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+
+
+def _update_weight_budget(resp):
+    """
+    When Binance reports that most of the per-minute request weight is used,
+    make every thread hold off until the next minute so parallel downloads
+    avoid 429/418 responses.
+    """
+    global _resume_at
+
+    used = resp.headers.get("X-MBX-USED-WEIGHT-1M")
+    if used is None:
+        return
+    if int(used) < config.WEIGHT_LIMIT_1M * config.WEIGHT_SAFETY_RATIO:
+        return
+
+    next_minute = time.monotonic() + 60 - datetime.now(timezone.utc).second
+    with _weight_lock:
+        _resume_at = max(_resume_at, next_minute)
+
+
+def _get(url, params=None):
+    _wait_for_weight_budget()
+    resp = SESSION.get(url, params=params, timeout=config.REQUEST_TIMEOUT)
+    resp.raise_for_status()
+    _update_weight_budget(resp)
+    return resp
+
+
 def fetch_spot_symbols():
     """
     Call Binance /api/v3/exchangeInfo and return the list of symbol objects
     that have SPOT permission.
     """
-    resp = requests.get(
-        config.EXCHANGE_INFO_URL,
-        params={"permissions": "SPOT"},
-        timeout=config.REQUEST_TIMEOUT,
-    )
-    resp.raise_for_status()
+    resp = _get(config.EXCHANGE_INFO_URL, params={"permissions": "SPOT"})
     data = resp.json()
     return data["symbols"]  
 
@@ -23,11 +79,7 @@ def fetch_24h_tickers():
     """
     Call Binance /api/v3/ticker/24hr and return the list of 24h ticker stats.
     """
-    resp = requests.get(
-        config.TICKER_24HR_URL,
-        timeout=config.REQUEST_TIMEOUT,
-    )
-    resp.raise_for_status()
+    resp = _get(config.TICKER_24HR_URL)
     return resp.json()  
 
 
@@ -57,12 +109,7 @@ def fetch_klines_range(symbol, start_date, end_date):
             "endTime": date_to_ms(end_date),
             "limit": config.MAX_KLINES_PER_REQUEST,
         }
-        resp = requests.get(
-            config.KLINES_URL,
-            params=params,
-            timeout=config.REQUEST_TIMEOUT,
-        )
-        resp.raise_for_status()
+        resp = _get(config.KLINES_URL, params=params)
         chunk = resp.json()
 
         if not chunk:
@@ -1,9 +1,13 @@
+import sys
+
 from db import get_connection
-from analysis.lstm_model import train_lstm_for_symbol
+from analysis.lstm_model import train_lstm_for_symbols
 
 if __name__ == "__main__":
+    symbols = sys.argv[1:] or ["AAVEBTC"]
     conn = get_connection()
     try:
-        train_lstm_for_symbol(conn, "AAVEBTC", lookback_days=30, epochs=15)
+        # TensorFlow already uses every core / the GPU, so symbols run in turn
+        train_lstm_for_symbols(conn, symbols, lookback_days=30, epochs=15)
     finally:
         conn.close()
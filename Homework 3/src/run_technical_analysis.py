@@ -1,9 +1,12 @@
+import sys
+
 from db import get_connection
-from analysis.technical_indicators import compute_and_store_indicators_for_symbol
+from analysis.technical_indicators import compute_and_store_indicators_for_symbols
 
 if __name__ == "__main__":
+    symbols = sys.argv[1:] or ["AAVEBTC"]
     conn = get_connection()
     try:
-        compute_and_store_indicators_for_symbol(conn, "AAVEBTC")
+        compute_and_store_indicators_for_symbols(conn, symbols)
     finally:
         conn.close()
@@ -0,0 +1,46 @@
+"""
+WHERE clauses for the /symbols search box.
+
+A query q always means LIKE '%Q%' (Q = q upper-cased, % and _ stay LIKE
+wildcards) on symbol, base_asset or quote_asset. Plain substrings of 3+
+characters are answered from the cc_fts trigram index instead.
+"""
+
+SEARCH_WILDCARDS = "%_"
+
+SEARCH_LIKE_WHERE = """
+    c.symbol LIKE ? OR c.base_asset LIKE ? OR c.quote_asset LIKE ?
+"""
+
+# substring search through the trigram index (needs 3+ characters)
+SEARCH_FTS_WHERE = """
+    c.id IN (SELECT rowid FROM cc_fts WHERE cc_fts MATCH ?)
+"""
+FTS_MIN_TERM_LENGTH = 3
+
+# search kind -> WHERE clause
+SEARCH_WHERE = {
+    "substring": SEARCH_FTS_WHERE,
+    "like": SEARCH_LIKE_WHERE,
+}
+
+
+def fts_phrase(term):
+    """Quote a search term as a single FTS5 phrase."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def like_params(q):
+    """Parameters for SEARCH_LIKE_WHERE; matches anywhere in the column."""
+    return ("%" + q.upper() + "%",) * 3
+
+
+def search_filter(q):
+    """
+    Return (kind, params) for a search query, kind being a SEARCH_WHERE key.
+    Queries without wildcards inside use the trigram index when long enough.
+    """
+    term = q.upper().strip("%")
+    if len(term) >= FTS_MIN_TERM_LENGTH and not any(ch in term for ch in SEARCH_WILDCARDS):
+        return "substring", (fts_phrase(term),)
+    return "like", like_params(q)
@@ -77,4 +77,72 @@ CREATE TABLE IF NOT EXISTS lstm_predictions (
 
     UNIQUE (symbol_id, prediction_date, timeframe, horizon_days, lookback_days),
     FOREIGN KEY (symbol_id) REFERENCES cryptocurrencies(id)
-);
\ No newline at end of file
+);
+
+CREATE INDEX IF NOT EXISTS idx_daily_symbol_vol ON daily_data(symbol_id, volume);
+
+-- /symbols/<s>/technical filters one timeframe and walks date backwards;
+-- UNIQUE (symbol_id, date, timeframe) would read every timeframe's rows
+CREATE INDEX IF NOT EXISTS idx_ti_symbol_tf_date
+    ON technical_indicators(symbol_id, timeframe, date);
+
+-- trigram full-text index over the searchable columns, kept in sync by triggers
+CREATE VIRTUAL TABLE IF NOT EXISTS cc_fts USING fts5(
+    symbol,
+    base_asset,
+    quote_asset,
+    content='cryptocurrencies',
+    content_rowid='id',
+    tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS cc_fts_ai AFTER INSERT ON cryptocurrencies BEGIN
+    INSERT INTO cc_fts (rowid, symbol, base_asset, quote_asset)
+    VALUES (new.id, new.symbol, new.base_asset, new.quote_asset);
+END;
+
+CREATE TRIGGER IF NOT EXISTS cc_fts_ad AFTER DELETE ON cryptocurrencies BEGIN
+    INSERT INTO cc_fts (cc_fts, rowid, symbol, base_asset, quote_asset)
+    VALUES ('delete', old.id, old.symbol, old.base_asset, old.quote_asset);
+END;
+
+CREATE TRIGGER IF NOT EXISTS cc_fts_au AFTER UPDATE OF symbol, base_asset, quote_asset ON cryptocurrencies BEGIN
+    INSERT INTO cc_fts (cc_fts, rowid, symbol, base_asset, quote_asset)
+    VALUES ('delete', old.id, old.symbol, old.base_asset, old.quote_asset);
+    INSERT INTO cc_fts (rowid, symbol, base_asset, quote_asset)
+    VALUES (new.id, new.symbol, new.base_asset, new.quote_asset);
+END;
+
+-- newest daily_data row per symbol, maintained by Filter 3 for /symbols
+CREATE TABLE IF NOT EXISTS latest_daily_data (
+    symbol_id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume REAL,
+    last_price_24h REAL,
+    volume_24h REAL,
+    high_24h REAL,
+    low_24h REAL,
+    liquidity REAL,
+    FOREIGN KEY (symbol_id) REFERENCES cryptocurrencies(id)
+);
+
+-- backfill symbols loaded before latest_daily_data existed
+INSERT OR IGNORE INTO latest_daily_data (
+    symbol_id, date, open, high, low, close, volume,
+    last_price_24h, volume_24h, high_24h, low_24h, liquidity
+)
+SELECT
+    d.symbol_id, d.date, d.open, d.high, d.low, d.close, d.volume,
+    d.last_price_24h, d.volume_24h, d.high_24h, d.low_24h, d.liquidity
+FROM daily_data d
+JOIN (
+    SELECT symbol_id, MAX(date) AS latest_date
+    FROM daily_data
+    GROUP BY symbol_id
+) m ON m.symbol_id = d.symbol_id AND m.latest_date = d.date
+-- only when the table is new/empty; Filter 3 keeps it current afterwards
+WHERE NOT EXISTS (SELECT 1 FROM latest_daily_data);
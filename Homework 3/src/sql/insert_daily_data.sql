@@ -12,18 +12,10 @@ INSERT INTO daily_data (
     low_24h,
     liquidity
 ) VALUES (
-    :symbol_id,
-    :date,
-    :open,
-    :high,
-    :low,
-    :close,
-    :volume,
-    :last_price_24h,
-    :volume_24h,
-    :high_24h,
-    :low_24h,
-    :liquidity
+    ?, ?,
+    ?, ?, ?, ?, ?,
+    ?, ?, ?, ?,
+    ?
 )
 ON CONFLICT(symbol_id, date) DO UPDATE SET
     open           = excluded.open,
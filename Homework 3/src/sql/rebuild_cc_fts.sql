@@ -0,0 +1 @@
+INSERT INTO cc_fts (cc_fts) VALUES ('rebuild');
@@ -1,3 +0,0 @@
-SELECT id 
-FROM cryptocurrencies 
-WHERE symbol = ?;
\ No newline at end of file
@@ -1,3 +0,0 @@
-SELECT MAX(date) AS last_date
-FROM daily_data
-WHERE symbol_id = ?;
\ No newline at end of file
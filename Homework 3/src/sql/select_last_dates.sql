@@ -0,0 +1,2 @@
+SELECT symbol_id, date AS last_date
+FROM latest_daily_data;
@@ -0,0 +1,31 @@
+INSERT OR REPLACE INTO latest_daily_data (
+    symbol_id,
+    date,
+    open,
+    high,
+    low,
+    close,
+    volume,
+    last_price_24h,
+    volume_24h,
+    high_24h,
+    low_24h,
+    liquidity
+)
+SELECT
+    symbol_id,
+    date,
+    open,
+    high,
+    low,
+    close,
+    volume,
+    last_price_24h,
+    volume_24h,
+    high_24h,
+    low_24h,
+    liquidity
+FROM daily_data
+WHERE symbol_id = ?
+ORDER BY date DESC
+LIMIT 1;
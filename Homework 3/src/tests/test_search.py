@@ -0,0 +1,74 @@
+import sqlite3
+
+import pytest
+
+import config
+from search import SEARCH_WHERE, search_filter
+
+
+SYMBOLS = [
+    ("AAVEBTC", "AAVE", "BTC"),
+    ("BTCUSDT", "BTC", "USDT"),
+    ("BTC_X", "BTC", "X"),
+    ("ETHBTC", "ETH", "BTC"),
+    ("ETHUSDT", "ETH", "USDT"),
+    ("WBTCBTC", "WBTC", "BTC"),
+]
+
+# what /symbols returned before the search was split by pattern shape
+BASELINE_SQL = """
+    SELECT c.symbol FROM cryptocurrencies c
+    WHERE c.symbol LIKE ? OR c.base_asset LIKE ? OR c.quote_asset LIKE ?
+    ORDER BY c.symbol
+"""
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript((config.SQL_DIR / "create_tables.sql").read_text(encoding="utf-8"))
+    conn.executemany(
+        "INSERT INTO cryptocurrencies (symbol, base_asset, quote_asset) VALUES (?, ?, ?)",
+        SYMBOLS,
+    )
+    yield conn
+    conn.close()
+
+
+def search(conn, q):
+    kind, params = search_filter(q)
+    sql = "SELECT c.symbol FROM cryptocurrencies c WHERE " + SEARCH_WHERE[kind] + " ORDER BY c.symbol"
+    return [row[0] for row in conn.execute(sql, params)]
+
+
+def baseline(conn, q):
+    like = f"%{q.upper()}%"
+    return [row[0] for row in conn.execute(BASELINE_SQL, (like,) * 3)]
+
+
+@pytest.mark.parametrize("q", [
+    "TC", "btc", "%btc", "btc%", "%btc%", "B_C", "BT*", "usdt", "e", "%", "",
+])
+def test_search_matches_baseline(conn, q):
+    assert search(conn, q) == baseline(conn, q)
+
+
+def test_plain_term_is_substring(conn):
+    assert search(conn, "TC") == ["AAVEBTC", "BTCUSDT", "BTC_X", "ETHBTC", "WBTCBTC"]
+
+
+def test_leading_wildcard_keeps_substring(conn):
+    assert "BTC_X" in search(conn, "%btc")
+
+
+def test_underscore_is_single_char_wildcard(conn):
+    assert "BTC_X" in search(conn, "B_C")
+
+
+def test_glob_specials_are_literal(conn):
+    assert search(conn, "BT*") == []
+
+
+def test_long_plain_term_uses_trigram_index():
+    assert search_filter("btc")[0] == "substring"
+    assert search_filter("tc")[0] == "like"